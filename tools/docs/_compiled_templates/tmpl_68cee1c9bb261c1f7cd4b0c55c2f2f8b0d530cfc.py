@@ -0,0 +1,46 @@
+from __future__ import generator_stop
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, concat, escape, identity, internalcode, markup_join, missing, str_join
+name = 'version_history_minor_index'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_minor_version = resolve('minor_version')
+    l_0_underline = resolve('underline')
+    l_0_current_release = resolve('current_release')
+    l_0_release_date = resolve('release_date')
+    l_0_original_release = resolve('original_release')
+    l_0_original_release_date = resolve('original_release_date')
+    l_0_patch_versions = resolve('patch_versions')
+    pass
+    yield '\n.. _version_history_'
+    yield str((undefined(name='minor_version') if l_0_minor_version is missing else l_0_minor_version))
+    yield ':\n\n'
+    yield str((undefined(name='minor_version') if l_0_minor_version is missing else l_0_minor_version))
+    yield '\n'
+    yield str((undefined(name='underline') if l_0_underline is missing else l_0_underline))
+    yield '\n\nLatest release:\n  `'
+    yield str((undefined(name='current_release') if l_0_current_release is missing else l_0_current_release))
+    yield ' <https://github.com/envoyproxy/envoy/releases/tag/v'
+    yield str((undefined(name='current_release') if l_0_current_release is missing else l_0_current_release))
+    yield '>`_ ('
+    yield str((undefined(name='release_date') if l_0_release_date is missing else l_0_release_date))
+    yield ')\n'
+    if ((undefined(name='current_release') if l_0_current_release is missing else l_0_current_release) != (undefined(name='original_release') if l_0_original_release is missing else l_0_original_release)):
+        pass
+        yield '\nInitial release date:\n  '
+        yield str((undefined(name='original_release_date') if l_0_original_release_date is missing else l_0_original_release_date))
+        yield '\n'
+    yield '\n\n.. toctree::\n  :titlesonly:\n  :maxdepth: 2\n  :caption: Changelog\n'
+    for l_1_version in (undefined(name='patch_versions') if l_0_patch_versions is missing else l_0_patch_versions):
+        _loop_vars = {}
+        pass
+        yield '\n  v'
+        yield str(environment.getattr(l_1_version, 'base_version'))
+    l_1_version = missing
+    yield '\n'
+
+blocks = {}
+debug_info = '2=19&4=21&5=23&8=25&9=31&11=34&18=37&19=41'
\ No newline at end of file
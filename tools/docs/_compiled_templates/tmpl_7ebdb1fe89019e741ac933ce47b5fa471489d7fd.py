@@ -0,0 +1,69 @@
+from __future__ import generator_stop
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, concat, escape, identity, internalcode, markup_join, missing, str_join
+name = 'version_history_index'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_dev_version = resolve('dev_version')
+    l_0_stable_message = resolve('stable_message')
+    l_0_stable_versions = resolve('stable_versions')
+    l_0_archived_message = resolve('archived_message')
+    l_0_archived_versions = resolve('archived_versions')
+    pass
+    yield '\n.. _version_history:\n\nVersion history\n---------------\n\n'
+    if (undefined(name='dev_version') if l_0_dev_version is missing else l_0_dev_version):
+        pass
+        yield '\n.. toctree::\n  :titlesonly:\n  :maxdepth: 2\n  :caption: Current development version\n\n  v'
+        yield str(environment.getattr((undefined(name='dev_version') if l_0_dev_version is missing else l_0_dev_version), 'major'))
+        yield '.'
+        yield str(environment.getattr((undefined(name='dev_version') if l_0_dev_version is missing else l_0_dev_version), 'minor'))
+        yield '/v'
+        yield str((undefined(name='dev_version') if l_0_dev_version is missing else l_0_dev_version))
+        yield '\n\n'
+    yield '\n\nStable versions\n===============\n\n'
+    yield str((undefined(name='stable_message') if l_0_stable_message is missing else l_0_stable_message))
+    yield '\n\n.. toctree::\n  :titlesonly:\n  :maxdepth: 2\n  :caption: Changelog\n'
+    for l_1_version in (undefined(name='stable_versions') if l_0_stable_versions is missing else l_0_stable_versions):
+        l_1_minor_versions = resolve('minor_versions')
+        l_1_release_dates = resolve('release_dates')
+        _loop_vars = {}
+        pass
+        yield '\n  v'
+        yield str(environment.getattr(l_1_version, 'base_version'))
+        yield ': '
+        yield str(environment.getattr(environment.getitem(environment.getitem((undefined(name='minor_versions') if l_1_minor_versions is missing else l_1_minor_versions), l_1_version), 0), 'base_version'))
+        yield ' ('
+        yield str(environment.getitem((undefined(name='release_dates') if l_1_release_dates is missing else l_1_release_dates), environment.getitem(environment.getitem((undefined(name='minor_versions') if l_1_minor_versions is missing else l_1_minor_versions), l_1_version), 0)))
+        yield ') <v'
+        yield str(environment.getattr(l_1_version, 'base_version'))
+        yield '/v'
+        yield str(environment.getattr(l_1_version, 'base_version'))
+        yield '>'
+    l_1_version = l_1_minor_versions = l_1_release_dates = missing
+    yield '\n\nArchived versions\n=================\n\n'
+    yield str((undefined(name='archived_message') if l_0_archived_message is missing else l_0_archived_message))
+    yield '\n\n.. toctree::\n  :titlesonly:\n  :maxdepth: 1\n'
+    for l_1_version in (undefined(name='archived_versions') if l_0_archived_versions is missing else l_0_archived_versions):
+        l_1_minor_versions = resolve('minor_versions')
+        l_1_release_dates = resolve('release_dates')
+        _loop_vars = {}
+        pass
+        yield '\n  v'
+        yield str(environment.getattr(l_1_version, 'base_version'))
+        yield ': '
+        yield str(environment.getattr(environment.getitem(environment.getitem((undefined(name='minor_versions') if l_1_minor_versions is missing else l_1_minor_versions), l_1_version), 0), 'base_version'))
+        yield ' ('
+        yield str(environment.getitem((undefined(name='release_dates') if l_1_release_dates is missing else l_1_release_dates), environment.getitem(environment.getitem((undefined(name='minor_versions') if l_1_minor_versions is missing else l_1_minor_versions), l_1_version), 0)))
+        yield ') <v'
+        yield str(environment.getattr(l_1_version, 'base_version'))
+        yield '/v'
+        yield str(environment.getattr(l_1_version, 'base_version'))
+        yield '>'
+    l_1_version = l_1_minor_versions = l_1_release_dates = missing
+    yield '\n\n.. _deprecated:\n\nDeprecation Policy\n==================\n\nAs of release 1.3.0, Envoy will follow a\n`Breaking Change Policy <https://github.com/envoyproxy/envoy/blob/main//CONTRIBUTING.md#breaking-change-policy>`_.\n\nFeatures in the deprecated list for each version have been DEPRECATED\nand will be removed in the specified release cycle. A logged warning\nis expected for each deprecated item that is in deprecation window.'
+
+blocks = {}
+debug_info = '7=17&13=20&20=27&26=29&27=35&33=47&38=49&39=55'
\ No newline at end of file
@@ -0,0 +1,55 @@
+from __future__ import generator_stop
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, concat, escape, identity, internalcode, markup_join, missing, str_join
+name = 'version_history'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_changelog = resolve('changelog')
+    l_0_underline = resolve('underline')
+    l_0_sections = resolve('sections')
+    pass
+    yield '\n.. _version_history_'
+    yield str(environment.getattr((undefined(name='changelog') if l_0_changelog is missing else l_0_changelog), 'version'))
+    yield ':\n\n'
+    yield str(environment.getattr((undefined(name='changelog') if l_0_changelog is missing else l_0_changelog), 'version'))
+    yield ' ('
+    yield str(environment.getattr((undefined(name='changelog') if l_0_changelog is missing else l_0_changelog), 'release_date'))
+    yield ')\n'
+    yield str((undefined(name='underline') if l_0_underline is missing else l_0_underline))
+    yield '\n\n'
+    for (l_1_section, l_1_section_underline, l_1_entries) in (undefined(name='sections') if l_0_sections is missing else l_0_sections):
+        l_1_versionize = resolve('versionize')
+        _loop_vars = {}
+        pass
+        yield '\n'
+        if l_1_entries:
+            pass
+            yield '\n'
+            yield str(environment.getattr(l_1_section, 'title'))
+            yield '\n'
+            yield str(l_1_section_underline)
+            yield '\n'
+            if environment.getattr(l_1_section, 'description'):
+                pass
+                yield '\n'
+                yield str(context.call((undefined(name='versionize') if l_1_versionize is missing else l_1_versionize), environment.getattr(l_1_section, 'description'), _loop_vars=_loop_vars))
+                yield '\n'
+            yield '\n\n'
+            for l_2_item in l_1_entries:
+                l_2_versionize_change = resolve('versionize_change')
+                _loop_vars = {}
+                pass
+                yield '* **'
+                yield str(environment.getattr(l_2_item, 'area'))
+                yield '**: '
+                yield str(context.call((undefined(name='versionize_change') if l_2_versionize_change is missing else l_2_versionize_change), environment.getattr(l_2_item, 'change'), _loop_vars=_loop_vars))
+            l_2_item = l_2_versionize_change = missing
+            yield '\n'
+    l_1_section = l_1_section_underline = l_1_entries = l_1_versionize = missing
+    yield '\n'
+
+blocks = {}
+debug_info = '2=15&4=17&5=21&7=23&8=28&9=31&10=33&11=35&12=38&15=41&16=46'
\ No newline at end of file
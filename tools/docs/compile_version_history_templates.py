@@ -0,0 +1,27 @@
+# Precompiles the version history templates to python modules, so that
+# `generate_version_histories` does not need to parse/compile them at runtime.
+#
+# Run this after updating any of the templates:
+#
+#   bazel run //tools/docs:compile_version_history_templates -- "${PWD}/tools/docs/_compiled_templates"
+#
+
+import pathlib
+import shutil
+import sys
+
+import jinja2
+
+from tools.docs import version_history_templates
+
+
+def main(output_path: str) -> None:
+    path = pathlib.Path(output_path)
+    if path.exists():
+        shutil.rmtree(path)
+    env = jinja2.Environment(loader=jinja2.DictLoader(version_history_templates.TEMPLATES))
+    env.compile_templates(path, zip=None, ignore_errors=False)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
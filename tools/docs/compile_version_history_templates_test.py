@@ -0,0 +1,26 @@
+"""Tests that the checked-in compiled version history templates are current.
+"""
+import pathlib
+import tempfile
+import unittest
+
+from tools.docs import compile_version_history_templates
+
+COMPILED_TEMPLATES_PATH = pathlib.Path(__file__).parent.joinpath("_compiled_templates")
+
+
+class CompileVersionHistoryTemplatesTest(unittest.TestCase):
+
+    def test_compiled_templates_are_current(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = pathlib.Path(tempdir).joinpath("_compiled_templates")
+            compile_version_history_templates.main(str(path))
+            expected = {p.name: p.read_text() for p in path.glob("*.py")}
+        actual = {p.name: p.read_text() for p in COMPILED_TEMPLATES_PATH.glob("*.py")}
+        self.assertEqual(
+            expected, actual, "Compiled version history templates are out of date, run "
+            "`compile_version_history_templates` to update them.")
+
+
+if __name__ == "__main__":
+    unittest.main()
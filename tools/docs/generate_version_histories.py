@@ -1,10 +1,13 @@
+import io
 import pathlib
 import re
 import sys
 import tarfile
-from functools import cached_property
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, lru_cache, partial
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Tuple
 
-from frozendict import frozendict
 import jinja2
 from packaging import version
 
@@ -15,235 +18,236 @@ from envoy.base.utils import IProject, Project
 
 # TODO(phlax): Move all of this to pytooling
 
-REFLINK_RE = re.compile(r":ref:[^>]*>`")
+# The templates in `version_history_templates` are precompiled to python
+# modules in `_compiled_templates`.
+COMPILED_TEMPLATES_PATH = pathlib.Path(__file__).parent.joinpath("_compiled_templates")
 
-VERSION_HISTORY_INDEX_TPL = """
-.. _version_history:
+REFLINK_RE = re.compile(r"(:ref:[^<>]*<)([^>]*>`)")
 
-Version history
----------------
 
-{% if dev_version %}
-.. toctree::
-  :titlesonly:
-  :maxdepth: 2
-  :caption: Current development version
+# This is called for every change and section description in every changelog,
+# section descriptions in particular are repeated for each version. It is only
+# called in the render workers, so each worker has its own cache, which goes
+# away with the worker pool.
+@lru_cache(maxsize=8192)
+def versionize_filter(text, minor_version, current_minor_version, indent=False):
+    """Replace refinks with versioned reflinks.
 
-  v{{ dev_version.major }}.{{ dev_version.minor }}/v{{ dev_version }}
+    If `indent` is set, all but the first line are also indented, so that the
+    text can be rendered as a list item.
+    """
+    if minor_version < current_minor_version and ":ref:" in text:
+        version_prefix = f"v{minor_version.base_version}:"
 
-{% endif %}
+        def _versionize(matched):
+            ref, target = matched.groups()
+            return matched[0] if ":" in target else f"{ref}{version_prefix}{target}"
 
-Stable versions
-===============
-
-{{ stable_message }}
-
-.. toctree::
-  :titlesonly:
-  :maxdepth: 2
-  :caption: Changelog
-{% for version in stable_versions %}
-  v{{ version.base_version }}: {{ changelogs[minor_versions[version][0]].version }} ({{ changelogs[minor_versions[version][0]].release_date }}) <v{{ version.base_version }}/v{{ version.base_version }}>
-{%- endfor %}
-
-Archived versions
-=================
-
-{{ archived_message }}
-
-.. toctree::
-  :titlesonly:
-  :maxdepth: 1
-{% for version in archived_versions %}
-  v{{ version.base_version }}: {{ changelogs[minor_versions[version][0]].version }} ({{ changelogs[minor_versions[version][0]].release_date }}) <v{{ version.base_version }}/v{{ version.base_version }}>
-{%- endfor %}
-
-.. _deprecated:
-
-Deprecation Policy
-==================
-
-As of release 1.3.0, Envoy will follow a
-`Breaking Change Policy <https://github.com/envoyproxy/envoy/blob/main//CONTRIBUTING.md#breaking-change-policy>`_.
-
-Features in the deprecated list for each version have been DEPRECATED
-and will be removed in the specified release cycle. A logged warning
-is expected for each deprecated item that is in deprecation window.
-"""
-
-VERSION_HISTORY_MINOR_INDEX_TPL = """
-.. _version_history_{{ minor_version }}:
+        text = REFLINK_RE.sub(_versionize, text)
+    if indent:
+        # Blank lines are not indented, as with jinja's `indent` filter.
+        first, *lines = text.split("\n")
+        text = "\n".join((first, *(f"  {line}" if line else line for line in lines)))
+    return text
 
-{{ minor_version }}
-{{ "-" * minor_version|length }}
 
-Latest release:
-  `{{ current_release }} <https://github.com/envoyproxy/envoy/releases/tag/v{{ current_release }}>`_ ({{ release_date }})
-{% if current_release != original_release.version %}
-Initial release date:
-  {{ original_release.release_date }}
-{% endif %}
+@lru_cache
+def jinja_env() -> jinja2.Environment:
+    # The templates are precompiled and do not change at runtime, so there is
+    # no need to check them for changes or to evict them from the cache.
+    return jinja2.Environment(
+        loader=jinja2.ModuleLoader(COMPILED_TEMPLATES_PATH), auto_reload=False, cache_size=-1)
 
-.. toctree::
-  :titlesonly:
-  :maxdepth: 2
-  :caption: Changelog
-{% for version in patch_versions %}
-  v{{ version.base_version }}
-{%- endfor %}
 
-"""
+def render(template: jinja2.Template, **context) -> bytes:
+    """Render a template to the encoded content of an rst file.
 
-VERSION_HISTORY_TPL = """
-.. _version_history_{{ changelog.version }}:
+    The templates only use the context they are passed, so this calls the
+    template's render function with a shared context directly, rather than
+    copying the context and environment globals with `Template.render`.
+    """
+    rendered = "".join(template.root_render_func(template.new_context(context, shared=True)))
+    return f"{rendered.strip()}\n\n".encode()
 
-{{ changelog.version }} ({{ changelog.release_date }})
-{{ "=" * (changelog.version|length + changelog.release_date|length + 4) }}
 
-{% for name, section in sections.items() %}
-{% if changelog.data[name] %}
-{{ section.title }}
-{{ "-" * section.title|length }}
-{% if section.description %}
-{{ section.description | versionize(minor_version, current_minor_version) }}
-{% endif %}
+class VersionHistory(NamedTuple):
+    path: str
+    release_date: str
+    content: bytes
 
-{% for item in changelog.entries(name) -%}
-* **{{ item.area }}**: {{ item.change | versionize(minor_version, current_minor_version) | indent(width=2, first=false) }}
-{%- endfor %}
-{% endif %}
-{%- endfor %}
 
-"""
+def render_version_history(path, changelog, sections, **context) -> VersionHistory:
+    """Render the version history for a changelog.
 
+    This is run in worker processes, so the template is loaded from the
+    process' own environment.
 
-def versionize_filter(text, minor_version, current_minor_version):
-    """Replace refinks with versioned reflinks."""
-    if minor_version >= current_minor_version:
-        return text
-    version_prefix = f"v{minor_version.base_version}:"
-    matches = set(REFLINK_RE.findall(text))
-    replacements = []
-
-    for matched in matches:
-        i = matched.find("<") + 1
-        remaining = matched[i:]
-        if ":" in remaining:
-            continue
-        replacements.append((matched, f"{matched[:i]}{version_prefix}{matched[i:]}"))
-
-    for sub, replacement in replacements:
-        text = text.replace(sub, replacement)
-    return text
+    Loading the changelog data is most of the work, so this is the only place
+    it is loaded, and the release date is returned for the index templates.
+    """
+    return VersionHistory(
+        path,
+        changelog.release_date,
+        render(
+            jinja_env().get_template("version_history"),
+            changelog=changelog,
+            # The entries for each section are sorted up front, and are empty
+            # for sections with no changes.
+            sections=tuple(
+                (section, underline, changelog.entries(name) if changelog.data.get(name) else ())
+                for name, section, underline in sections),
+            underline="=" * (len(changelog.version) + len(changelog.release_date) + 4),
+            **context))
 
 
 class VersionHistories(runner.Runner):
 
-    @cached_property
-    def jinja_env(self) -> jinja2.Environment:
-        env = jinja2.Environment()
-        env.filters["versionize"] = versionize_filter
-        return env
-
     @cached_property
     def project(self) -> IProject:
         return Project(self.args.version)
 
     @cached_property
-    def sections(self) -> frozendict:
-        return self.project.changelogs.sections
+    def release_dates(self) -> Dict[version.Version, str]:
+        return {
+            changelog_version: version_history.release_date
+            for changelog_version, version_history in self.version_histories.items()
+        }
 
     @cached_property
-    def tpath(self) -> pathlib.Path:
-        return pathlib.Path(self.tempdir.name)
+    def sections(self) -> Tuple[Tuple[str, dict, str], ...]:
+        return tuple((name, section, "-" * len(section["title"]))
+                     for name, section in self.project.changelogs.sections.items())
 
     @cached_property
     def version_history_index_tpl(self):
-        return self.jinja_env.from_string(VERSION_HISTORY_INDEX_TPL)
+        return jinja_env().get_template("version_history_index")
 
     @cached_property
     def version_history_minor_index_tpl(self):
-        return self.jinja_env.from_string(VERSION_HISTORY_MINOR_INDEX_TPL)
-
-    @cached_property
-    def version_history_tpl(self):
-        return self.jinja_env.from_string(VERSION_HISTORY_TPL)
+        return jinja_env().get_template("version_history_minor_index")
 
     def add_arguments(self, parser) -> None:
         super().add_arguments(parser)
         parser.add_argument("version")
         parser.add_argument("output_file")
 
-    def minor_index_path(self, minor_version) -> pathlib.Path:
-        return self.tpath.joinpath(f"v{minor_version.base_version}").joinpath(
-            f"v{minor_version.base_version}.rst")
+    def minor_index_path(self, minor_version: version.Version) -> str:
+        return f"{self.minor_path(minor_version)}/v{minor_version.base_version}.rst"
 
-    @runner.cleansup
-    async def run(self) -> None:
-        self.write_version_history_index()
-        self.write_version_histories()
-        self.write_version_history_minor_indeces()
-        self.write_tarball()
-
-    def write_tarball(self) -> None:
-        with tarfile.open(self.args.output_file, "w") as tarball:
-            tarball.add(self.tpath, arcname="./")
-
-    def write_version_histories(self) -> None:
-        for changelog_version in self.project.changelogs:
-            self.write_version_history(changelog_version)
-
-    def write_version_history(self, changelog_version: version.Version) -> None:
-        minor_version = utils.minor_version_for(changelog_version)
-        root_path = self.tpath.joinpath(f"v{minor_version.base_version}")
-        root_path.mkdir(parents=True, exist_ok=True)
-        version_history = self.version_history_tpl.render(
-            current_minor_version=self.project.minor_version,
-            minor_version=minor_version,
-            current_version=self.project.version,
-            sections=self.sections,
-            changelog=self.project.changelogs[changelog_version])
-        version_path = root_path.joinpath(f"v{changelog_version}.rst")
-        version_path.write_text(f"{version_history.strip()}\n\n")
+    def minor_path(self, minor_version: version.Version) -> str:
+        return f"./v{minor_version.base_version}"
 
-    def write_version_history_index(self) -> None:
+    @cached_property
+    def version_histories(self) -> Dict[version.Version, VersionHistory]:
+        changelogs = self.project.changelogs
+        current_version = self.project.version
+        sections = self.sections
+        minor_changelogs = defaultdict(list)
+        for changelog_version in changelogs:
+            minor_changelogs[utils.minor_version_for(changelog_version)].append(changelog_version)
+        # Rendering the changelogs is independent and cpu-bound, so is
+        # spread across processes.
+        version_histories = {}
+        with ProcessPoolExecutor() as pool:
+            for minor_version, changelog_versions in minor_changelogs.items():
+                root_path = self.minor_path(minor_version)
+                versionizers = self.versionizers_for(minor_version)
+                for changelog_version in changelog_versions:
+                    version_histories[changelog_version] = pool.submit(
+                        render_version_history,
+                        f"{root_path}/v{changelog_version}.rst",
+                        **versionizers,
+                        current_version=current_version,
+                        sections=sections,
+                        changelog=changelogs[changelog_version])
+        return {
+            changelog_version: version_history.result()
+            for changelog_version, version_history in version_histories.items()
+        }
+
+    def render_version_history_index(self) -> Tuple[str, bytes]:
         stable_message = (
             "Versions that are currently supported." if self.project.is_main_dev else
             "Versions that were supported when this branch was initially released.")
         archived_message = (
             "Versions that are no longer supported." if self.project.is_main_dev else
             "Versions that were no longer supported when this branch was initially released.")
-        version_history_rst = self.version_history_index_tpl.render(
+        return "./version_history.rst", render(
+            self.version_history_index_tpl,
             archived_message=archived_message,
             stable_message=stable_message,
             dev_version=self.project.dev_version,
-            changelogs=self.project.changelogs,
+            release_dates=self.release_dates,
             minor_versions=self.project.minor_versions,
             stable_versions=self.project.stable_versions,
             archived_versions=self.project.archived_versions)
-        self.tpath.joinpath("version_history.rst").write_text(f"{version_history_rst.strip()}\n\n")
 
-    def write_version_history_minor_indeces(self) -> None:
+    def render_version_history_minor_indeces(self) -> Iterator[Tuple[str, bytes]]:
+        is_main_dev = self.project.is_main_dev
         for i, (minor_version, patches) in enumerate(self.project.minor_versions.items()):
-            if self.project.is_main_dev and i == 0:
+            if is_main_dev and i == 0:
                 continue
-            self.write_version_history_minor_index(minor_version, patches)
+            yield self.render_version_history_minor_index(minor_version, patches)
 
-    def write_version_history_minor_index(
-            self, minor_version: version.Version, patch_versions) -> None:
+    def render_version_history_minor_index(self, minor_version: version.Version,
+                                           patch_versions) -> Tuple[str, bytes]:
         skip_first = (self.project.is_dev and self.project.is_current(patch_versions[0]))
         if skip_first:
             patch_versions = patch_versions[1:]
         current_release = patch_versions[0]
-        original_release = self.project.changelogs[patch_versions[-1]]
-        version_history_minor_index = self.version_history_minor_index_tpl.render(
-            minor_version=f"v{minor_version.base_version}",
+        original_release = patch_versions[-1]
+        minor = f"v{minor_version.base_version}"
+        return self.minor_index_path(minor_version), render(
+            self.version_history_minor_index_tpl,
+            minor_version=minor,
+            underline="-" * len(minor),
             current_release=current_release.base_version,
-            original_release=original_release,
-            release_date=self.project.changelogs[current_release].release_date,
+            original_release=original_release.base_version,
+            original_release_date=self.release_dates[original_release],
+            release_date=self.release_dates[current_release],
             patch_versions=patch_versions)
-        self.minor_index_path(minor_version).write_text(
-            f"{version_history_minor_index.strip()}\n\n")
+
+    @runner.cleansup
+    async def run(self) -> None:
+        # The index templates use the release dates returned from rendering
+        # the version histories, so the changelogs (which are loaded in the
+        # render workers) are not loaded again here.
+        self.write_tarball((
+            self.render_version_history_index(),
+            *((version_history.path, version_history.content)
+              for version_history in self.version_histories.values()),
+            *self.render_version_history_minor_indeces()))
+
+    def write_tarball(self, files: Iterable[Tuple[str, bytes]]) -> None:
+        # The rendered files are added directly from memory, rather than being
+        # written to and re-read from disk, and the archive is streamed to
+        # the output file in large chunks.
+        with tarfile.open(self.args.output_file, mode="w|", bufsize=1 << 20,
+                          format=tarfile.PAX_FORMAT) as tarball:
+            for path, content in files:
+                tarball.addfile(self.tarinfo(path, len(content)), io.BytesIO(content))
+
+    def tarinfo(self, path: str, size: int) -> tarfile.TarInfo:
+        # Files are added with fixed metadata, so that the archive is
+        # reproducible.
+        info = tarfile.TarInfo(path)
+        info.size = size
+        info.mtime = 0
+        info.mode = 0o644
+        info.uid = info.gid = 0
+        info.uname = info.gname = ""
+        return info
+
+    def versionizers_for(self, minor_version: version.Version) -> Dict[str, Callable[[str], str]]:
+        current_minor_version = self.project.minor_version
+        versionize = partial(
+            versionize_filter,
+            minor_version=minor_version,
+            current_minor_version=current_minor_version)
+        return dict(
+            # Reflinks only need versioning for previous minor versions.
+            versionize=(str if minor_version >= current_minor_version else versionize),
+            versionize_change=partial(versionize, indent=True))
 
 
 def main():
@@ -0,0 +1,108 @@
+from frozendict import frozendict
+
+# These templates are precompiled to python modules in `_compiled_templates`,
+# if you change them run `compile_version_history_templates` to update.
+
+VERSION_HISTORY_INDEX_TPL = """
+.. _version_history:
+
+Version history
+---------------
+
+{% if dev_version %}
+.. toctree::
+  :titlesonly:
+  :maxdepth: 2
+  :caption: Current development version
+
+  v{{ dev_version.major }}.{{ dev_version.minor }}/v{{ dev_version }}
+
+{% endif %}
+
+Stable versions
+===============
+
+{{ stable_message }}
+
+.. toctree::
+  :titlesonly:
+  :maxdepth: 2
+  :caption: Changelog
+{% for version in stable_versions %}
+  v{{ version.base_version }}: {{ minor_versions[version][0].base_version }} ({{ release_dates[minor_versions[version][0]] }}) <v{{ version.base_version }}/v{{ version.base_version }}>
+{%- endfor %}
+
+Archived versions
+=================
+
+{{ archived_message }}
+
+.. toctree::
+  :titlesonly:
+  :maxdepth: 1
+{% for version in archived_versions %}
+  v{{ version.base_version }}: {{ minor_versions[version][0].base_version }} ({{ release_dates[minor_versions[version][0]] }}) <v{{ version.base_version }}/v{{ version.base_version }}>
+{%- endfor %}
+
+.. _deprecated:
+
+Deprecation Policy
+==================
+
+As of release 1.3.0, Envoy will follow a
+`Breaking Change Policy <https://github.com/envoyproxy/envoy/blob/main//CONTRIBUTING.md#breaking-change-policy>`_.
+
+Features in the deprecated list for each version have been DEPRECATED
+and will be removed in the specified release cycle. A logged warning
+is expected for each deprecated item that is in deprecation window.
+"""
+
+VERSION_HISTORY_MINOR_INDEX_TPL = """
+.. _version_history_{{ minor_version }}:
+
+{{ minor_version }}
+{{ underline }}
+
+Latest release:
+  `{{ current_release }} <https://github.com/envoyproxy/envoy/releases/tag/v{{ current_release }}>`_ ({{ release_date }})
+{% if current_release != original_release %}
+Initial release date:
+  {{ original_release_date }}
+{% endif %}
+
+.. toctree::
+  :titlesonly:
+  :maxdepth: 2
+  :caption: Changelog
+{% for version in patch_versions %}
+  v{{ version.base_version }}
+{%- endfor %}
+
+"""
+
+VERSION_HISTORY_TPL = """
+.. _version_history_{{ changelog.version }}:
+
+{{ changelog.version }} ({{ changelog.release_date }})
+{{ underline }}
+
+{% for section, section_underline, entries in sections %}
+{% if entries %}
+{{ section.title }}
+{{ section_underline }}
+{% if section.description %}
+{{ versionize(section.description) }}
+{% endif %}
+
+{% for item in entries -%}
+* **{{ item.area }}**: {{ versionize_change(item.change) }}
+{%- endfor %}
+{% endif %}
+{%- endfor %}
+
+"""
+
+TEMPLATES = frozendict(
+    version_history_index=VERSION_HISTORY_INDEX_TPL,
+    version_history_minor_index=VERSION_HISTORY_MINOR_INDEX_TPL,
+    version_history=VERSION_HISTORY_TPL)